@@ -3,15 +3,24 @@
 Network Switch Configuration Backup Script
 Written by a Network Engineer for Network Engineers
 Purpose: Automated backup of switch configurations using SSH
+
+Install the libraries it needs first:
+    pip install netmiko asyncssh aiofiles zstandard "httpx[http2]"
 """
 
+import aiofiles
+import asyncssh
+import httpx
+import zstandard
 from netmiko import ConnectHandler
+from hosts import load_hosts, resolve_hostnames, device_address
 from datetime import datetime
+import asyncio
+import contextlib
+import hashlib
+import io
 import os
 import sys
-import time
-import csv
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 # Configure logging
@@ -26,35 +35,18 @@ logging.basicConfig(
 
 def read_hosts_file(filename='hosts.txt'):
     """Read device information from hosts.txt file"""
-    devices = []
     try:
-        with open(filename, 'r') as file:
-            reader = csv.reader(file)
-            for line_num, row in enumerate(reader, 1):
-                # Skip comments and empty lines
-                if not row or row[0].strip().startswith('#'):
-                    continue
-                
-                if len(row) < 4:
-                    logging.warning(f"Line {line_num}: Skipping incomplete entry")
-                    continue
-                
-                device = {
-                    'device_type': row[3].strip(),
-                    'ip': row[0].strip(),
-                    'username': row[1].strip(),
-                    'password': row[2].strip(),
-                    'port': 22,
-                    'timeout': 30,
-                    'global_delay_factor': 2
-                }
-                devices.append(device)
-                print(device)
+        devices = [
+            {**host, 'port': 22, 'timeout': 30, 'global_delay_factor': 2}
+            for host in load_hosts(filename)
+        ]
         logging.info(f"Loaded {len(devices)} devices from {filename}")
         return devices
         
     except FileNotFoundError:
-        logging.error(f"Error: {filename} not found!")
+        logging.error(f"Error: {filename} file not found!")
+        logging.info(f"Please create a {filename} file with device information.")
+        logging.info("Format: ip_address,username,password,device_type")
         sys.exit(1)
     except Exception as e:
         logging.error(f"Error reading hosts file: {str(e)}")
@@ -65,60 +57,340 @@ def create_backup_folder():
     today = datetime.now().strftime("%Y-%m-%d")
     backup_folder = f"backups/{today}"
     
-    if not os.path.exists(backup_folder):
-        os.makedirs(backup_folder)
-        logging.info(f"Created backup folder: {backup_folder}")
+    os.makedirs(backup_folder, exist_ok=True)
+    logging.info(f"Using backup folder: {backup_folder}")
     
     return backup_folder
 
-def backup_single_device(device, backup_folder, retry_count=3):
+def latest_backup_paths(hostname):
+    """Per-device files: hash of the last saved config, and a link to it"""
+    device_folder = f"backups/{hostname}"
+    return f"{device_folder}/latest.sha256", f"{device_folder}/latest.txt.zst"
+
+def read_latest_digest(hostname):
+    """Hash of the last saved config for this device, or None"""
+    digest_file, _ = latest_backup_paths(hostname)
+    try:
+        with open(digest_file) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def record_latest_backup(hostname, filename, digest):
+    """Remember the hash of a new backup and point latest.txt.zst at it"""
+    digest_file, latest_link = latest_backup_paths(hostname)
+    os.makedirs(os.path.dirname(digest_file), exist_ok=True)
+    
+    # Write to a temp file and rename, so a crash never leaves half a hash
+    with open(f"{digest_file}.tmp", 'w') as f:
+        f.write(digest + "\n")
+    os.replace(f"{digest_file}.tmp", digest_file)
+    
+    # Symlinks are not available everywhere (e.g. Windows without
+    # developer mode) - the hash file alone is enough to skip writes
+    with contextlib.suppress(OSError):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(f"{latest_link}.tmp")
+        os.symlink(os.path.relpath(filename, os.path.dirname(latest_link)), f"{latest_link}.tmp")
+        os.replace(f"{latest_link}.tmp", latest_link)
+
+def touch_latest_backup(hostname):
+    """Mark the latest backup as checked just now, without rewriting it"""
+    _, latest_link = latest_backup_paths(hostname)
+    with contextlib.suppress(OSError, NotImplementedError):
+        os.utime(latest_link, follow_symlinks=False)
+
+def url_host(address):
+    """IPv6 addresses need [brackets] inside a URL"""
+    if ':' in address:
+        return f"[{address}]"
+    return address
+
+# Device types that accept commands on a plain SSH exec channel
+# (the login user needs privilege 15, there is no 'enable' step).
+# Everything else still goes through Netmiko's interactive session.
+ASYNCSSH_DEVICE_TYPES = {'cisco_ios', 'cisco_xe', 'cisco_nxos', 'arista_eos'}
+
+# Default cap on devices backed up at once (like OpenSSH's MaxStartups,
+# many SSH servers start dropping new connections beyond a few dozen)
+MAX_CONCURRENCY = 64
+
+# Read size when streaming command output into a backup file
+CHUNK_SIZE = 64 * 1024
+
+# Device types backed up over the HTTPS API (Arista eAPI) instead of the CLI
+EAPI_DEVICE_TYPES = {'arista_eos'}
+
+# Open SSH connections, keyed by (username, host).
+# Each backup opens a new channel on the cached connection instead of
+# doing a fresh SSH handshake.
+ssh_connections = {}
+
+# One lock per (username, host), so devices that share a connection
+# wait for the first handshake instead of each starting their own
+ssh_connect_locks = {}
+
+async def get_ssh_connection(device):
+    """Return a cached SSH connection for the device, connecting if needed"""
+    key = (device['username'], device['ip'])
+    
+    async with ssh_connect_locks.setdefault(key, asyncio.Lock()):
+        connection = ssh_connections.get(key)
+        
+        if connection is None:
+            connection = await asyncssh.connect(
+                device_address(device),
+                port=device['port'],
+                username=device['username'],
+                password=device['password'],
+                known_hosts=None,
+                connect_timeout=device['timeout'],
+                # Keep the connection alive between commands and retries
+                keepalive_interval=30,
+                keepalive_count_max=3
+            )
+            ssh_connections[key] = connection
+    
+    return connection
+
+# Errors that mean the SSH connection itself is broken or stuck.
+# ConnectionError covers resets and broken pipes, but not disk errors
+SSH_CONNECTION_ERRORS = (asyncssh.Error, ConnectionError, asyncio.TimeoutError)
+
+def drop_ssh_connection(device):
+    """Forget a cached connection so the next attempt reconnects"""
+    connection = ssh_connections.pop((device['username'], device['ip']), None)
+    if connection is not None:
+        connection.close()
+
+# One HTTP client for the whole run, so each switch keeps its
+# TLS connection open between API requests
+eapi_client = None
+
+def get_eapi_client():
+    """Return the shared eAPI HTTP client, creating it on first use"""
+    global eapi_client
+    
+    if eapi_client is None:
+        try:
+            # HTTP/2 needs the 'h2' package (pip install "httpx[http2]")
+            eapi_client = httpx.AsyncClient(
+                http2=True,
+                verify=False,  # Switches usually have self-signed certificates
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
+        except ImportError:
+            # No h2 installed - plain HTTP/1.1 works too, just a bit slower
+            logging.info("h2 not installed, using HTTP/1.1 for eAPI")
+            eapi_client = httpx.AsyncClient(
+                verify=False,
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
+    
+    return eapi_client
+
+async def close_connections():
+    """Close every cached SSH connection and the eAPI client"""
+    global eapi_client
+    
+    for connection in ssh_connections.values():
+        connection.close()
+        await connection.wait_closed()
+    ssh_connections.clear()
+    ssh_connect_locks.clear()
+    
+    if eapi_client is not None:
+        await eapi_client.aclose()
+        eapi_client = None
+
+async def get_config_with_eapi(device):
+    """Get the running configuration with one eAPI request"""
+    response = await get_eapi_client().post(
+        f"https://{url_host(device_address(device))}/command-api",
+        auth=(device['username'], device['password']),
+        json={
+            'jsonrpc': '2.0',
+            'method': 'runCmds',
+            'params': {
+                'version': 1,
+                'cmds': ['enable', 'show running-config'],
+                'format': 'text'
+            },
+            'id': 'backup'
+        },
+        timeout=device['timeout']
+    )
+    response.raise_for_status()
+    reply = response.json()
+    
+    if 'error' in reply:
+        raise RuntimeError(f"eAPI error: {reply['error'].get('message')}")
+    
+    # One result per command, the config is the last one
+    return reply['result'][-1]['output']
+
+def get_config_with_netmiko(device):
+    """Fallback for device types that need an interactive CLI session"""
+    connection = ConnectHandler(**{**device, 'ip': device_address(device)})
+    
+    # Enter enable mode if needed
+    if connection.check_enable_mode() is False:
+        connection.enable()
+    
+    config_output = connection.send_command('show running-config')
+    
+    # For some devices, might need different command
+    if not config_output or len(config_output) < 100:
+        config_output = connection.send_command('show run')
+    
+    connection.disconnect()
+    return config_output
+
+class BackupWriter:
+    """
+    Builds one backup: everything is zstd-compressed as it arrives, and a
+    SHA-256 of the config (not the timestamped header) is kept so unchanged
+    configs can be spotted. Only the compressed bytes are kept in memory
+    (tens of KB for a switch config) - nothing touches the disk until we
+    know the config changed.
+    """
+    def __init__(self, header):
+        self.header = header.encode()
+    
+    def start(self):
+        """Begin (or begin again) with just the header"""
+        self.buffer = io.BytesIO()
+        self.compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        self.digest = hashlib.sha256()
+        self.buffer.write(self.compressor.compress(self.header))
+    
+    def write(self, data):
+        """Add config text to the backup"""
+        self.digest.update(data)
+        self.buffer.write(self.compressor.compress(data))
+    
+    def finish(self):
+        """Flush the last compressed bytes, return the config's hash"""
+        self.buffer.write(self.compressor.flush())
+        return self.digest.hexdigest()
+    
+    async def save(self, filename):
+        """
+        Write the compressed backup to filename. It goes into a .part file
+        first, which is only renamed to the real name once it is complete
+        """
+        partial_filename = f"{filename}.part"
+        try:
+            # aiofiles does the disk write in a thread, so other
+            # backups keep running while this file is flushed
+            async with aiofiles.open(partial_filename, 'wb') as f:
+                await f.write(self.buffer.getvalue())
+            os.replace(partial_filename, filename)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial_filename)
+            raise
+
+async def stream_command_output(connection, command, writer):
+    """
+    Copy a command's output from the SSH channel straight into the backup,
+    one chunk at a time - only the compressed copy is kept, never the
+    whole plain-text config.
+    Returns the number of bytes read.
+    """
+    written = 0
+    
+    async with connection.create_process(command, encoding=None) as process:
+        while chunk := await process.stdout.read(CHUNK_SIZE):
+            writer.write(chunk)
+            written += len(chunk)
+    
+    return written
+
+async def write_running_config(device, writer):
+    """Write the device's running configuration into the backup"""
+    if device['device_type'] in EAPI_DEVICE_TYPES:
+        try:
+            config_output = await get_config_with_eapi(device)
+            writer.write(config_output.encode())
+            return
+        except httpx.ConnectError:
+            # eAPI not enabled on this switch - use SSH instead
+            logging.info(f"eAPI not reachable on {device['ip']}, using SSH")
+    elif device['device_type'] not in ASYNCSSH_DEVICE_TYPES:
+        config_output = await asyncio.to_thread(get_config_with_netmiko, device)
+        writer.write(config_output.encode())
+        return
+    
+    connection = await get_ssh_connection(device)
+    written = await asyncio.wait_for(
+        stream_command_output(connection, 'show running-config', writer),
+        device['timeout']
+    )
+    
+    # For some devices, might need different command
+    if written < 100:
+        writer.start()
+        await asyncio.wait_for(
+            stream_command_output(connection, 'show run', writer),
+            device['timeout']
+        )
+
+async def backup_single_device(device, backup_folder, semaphore, retry_count=3):
     """Backup configuration for a single device with retry logic"""
     hostname = device.get('hostname', device['ip'])
     
     for attempt in range(retry_count):
+        timestamp = datetime.now().strftime("%H%M%S")
+        filename = f"{backup_folder}/{hostname}_{timestamp}.txt.zst"
+        
         try:
-            # Connect to device
-            logging.info(f"Connecting to {hostname} ({device['ip']})...")
-            connection = ConnectHandler(**device)
-            
-            # Enter enable mode if needed
-            if connection.check_enable_mode() is False:
-                connection.enable()
-            
-            # Get running configuration
-            logging.info(f"Retrieving configuration from {hostname}...")
-            config_output = connection.send_command('show running-config')
-            
-            # For some devices, might need different command
-            if not config_output or len(config_output) < 100:
-                config_output = connection.send_command('show run')
-            
-            # Disconnect
-            connection.disconnect()
+            async with semaphore:
+                # Connect to device (reuses an open connection if we have one)
+                logging.info(f"Connecting to {hostname} ({device['ip']})...")
+                
+                writer = BackupWriter(
+                    f"! Backup of {hostname} ({device['ip']})\n"
+                    f"! Backup taken on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"! Device type: {device['device_type']}\n"
+                    "!\n"
+                )
+                writer.start()
+                
+                # Get running configuration
+                logging.info(f"Retrieving configuration from {hostname}...")
+                await write_running_config(device, writer)
+                digest = writer.finish()
             
-            # Save configuration to file
-            timestamp = datetime.now().strftime("%H%M%S")
-            filename = f"{backup_folder}/{hostname}_{timestamp}.txt"
+            # Skip saving if the config is the same as the last backup -
+            # no file is written at all
+            if digest == read_latest_digest(hostname):
+                touch_latest_backup(hostname)
+                logging.info(f"✅ UNCHANGED: {hostname} config is the same as the last backup")
+                return {'status': 'success', 'device': hostname, 'filename': None, 'unchanged': True}
             
-            with open(filename, 'w') as f:
-                f.write(f"! Backup of {hostname} ({device['ip']})\n")
-                f.write(f"! Backup taken on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"! Device type: {device['device_type']}\n")
-                f.write("!\n")
-                f.write(config_output)
+            await writer.save(filename)
+            record_latest_backup(hostname, filename, digest)
             
             logging.info(f"✅ SUCCESS: {hostname} backed up to {filename}")
             return {'status': 'success', 'device': hostname, 'filename': filename}
             
         except Exception as e:
             logging.error(f"❌ FAILED: {hostname} - Attempt {attempt + 1}/{retry_count}: {str(e)}")
+            # Only throw the SSH connection away if it is the problem.
+            # A local error (like a failed file write) keeps it for the retry
+            if isinstance(e, SSH_CONNECTION_ERRORS):
+                drop_ssh_connection(device)
             if attempt < retry_count - 1:
-                time.sleep(5)  # Wait before retry
+                await asyncio.sleep(5)  # Wait before retry
             else:
                 return {'status': 'failed', 'device': hostname, 'error': str(e)}
 
-def backup_all_switches_parallel(max_workers=5):
-    """Backup all switches in parallel for faster execution"""
+async def backup_all_switches_parallel(concurrency=None):
+    """
+    Backup all switches in parallel for faster execution
+    concurrency: how many devices at once (default: all of them, up to 64)
+    """
     # Read devices from file
     devices = read_hosts_file()
     
@@ -129,26 +401,28 @@ def backup_all_switches_parallel(max_workers=5):
     # Create backup folder
     backup_folder = create_backup_folder()
     
-    # Summary statistics
-    results = {'success': [], 'failed': []}
+    # Resolve hostnames up front instead of once per connection
+    await resolve_hostnames(devices)
     
     logging.info(f"\n{'='*60}")
     logging.info(f"Starting backup for {len(devices)} devices")
     logging.info(f"{'='*60}\n")
     
-    # Backup devices in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_device = {
-            executor.submit(backup_single_device, device, backup_folder): device 
-            for device in devices
-        }
-        
-        for future in as_completed(future_to_device):
-            result = future.result()
-            if result['status'] == 'success':
-                results['success'].append(result)
-            else:
-                results['failed'].append(result)
+    # Backup devices in parallel. These are coroutines, not threads, so
+    # the limit is what the network and SSH servers can take
+    if concurrency is None:
+        concurrency = min(len(devices), MAX_CONCURRENCY)
+    logging.info(f"Backing up {concurrency} devices at a time")
+    semaphore = asyncio.Semaphore(concurrency)
+    # gather keeps the results in hosts.txt order, whatever order they finish in
+    backup_results = await asyncio.gather(
+        *[backup_single_device(device, backup_folder, semaphore) for device in devices]
+    )
+    
+    # Summary statistics
+    results = {'success': [], 'failed': []}
+    for result in backup_results:
+        results['success' if result['status'] == 'success' else 'failed'].append(result)
     
     # Print summary
     logging.info(f"\n{'='*60}")
@@ -156,6 +430,7 @@ def backup_all_switches_parallel(max_workers=5):
     logging.info(f"{'='*60}")
     logging.info(f"Total devices: {len(devices)}")
     logging.info(f"Successful: {len(results['success'])}")
+    logging.info(f"Unchanged (not saved again): {sum(1 for r in results['success'] if r.get('unchanged'))}")
     logging.info(f"Failed: {len(results['failed'])}")
     
     if results['failed']:
@@ -166,18 +441,26 @@ def backup_all_switches_parallel(max_workers=5):
     logging.info(f"\nBackups saved in: {backup_folder}")
     logging.info(f"{'='*60}\n")
 
+async def backup_all_switches(concurrency=None):
+    """Run the backup, then close the connections it opened"""
+    try:
+        await backup_all_switches_parallel(concurrency)
+    finally:
+        await close_connections()
+
 def main():
     """Main function"""
+    # Optional: how many devices to back up at the same time
+    # (a whole number, at least 1 - with 0 no backup would ever start)
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and not (sys.argv[1].isdigit() and int(sys.argv[1]) >= 1)):
+        print("Usage: python backup-all-switches.py [concurrency]")
+        print("Example: python backup-all-switches.py 20")
+        sys.exit(1)
+    concurrency = int(sys.argv[1]) if len(sys.argv) == 2 else None
+    
     try:
-        # Check if hosts.txt exists
-        if not os.path.exists('hosts.txt'):
-            logging.error("Error: hosts.txt file not found!")
-            logging.info("Please create a hosts.txt file with device information.")
-            logging.info("Format: ip_address,username,password,device_type")
-            sys.exit(1)
-        
-        # Run backup
-        backup_all_switches_parallel()
+        # Run backup (a missing hosts.txt is reported when it is read)
+        asyncio.run(backup_all_switches(concurrency))
         
     except KeyboardInterrupt:
         logging.info("\nBackup interrupted by user")
@@ -187,4 +470,11 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # uvloop is a faster event loop (Linux/macOS) - use it if it's installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     main()
\ No newline at end of file
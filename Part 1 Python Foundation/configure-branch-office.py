@@ -4,71 +4,42 @@ Branch Office Configuration Generator
 Generates router and switch configurations for branch offices
 """
 
+import io
 import sys
+import tarfile
+import time
 from datetime import datetime
+from string import Template
 
-
-def read_hosts_file(filename='hosts.txt'):
-    """Read device information from hosts.txt file"""
-    devices = []
-    try:
-        with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if line.startswith('#') or not line:
-                    continue
-                
-                # Parse: ip_address only (for config generation)
-                ip_address = line.split(',')[0].strip()
-                if ip_address:
-                    device = {
-                        'ip': ip_address
-                    }
-                    devices.append(device)
-                else:
-                    print(f"⚠️  Skipping invalid line: {line}")
-    except FileNotFoundError:
-        print(f"⚠️  Warning: {filename} not found. Using example devices.")
-        # Example devices if no hosts file
-        devices = [
-            {'ip': '10.50.1.1'},
-            {'ip': '10.50.10.2'}
-        ]
-    
-    return devices
+from hosts import load_host_ips
 
 
-def generate_router_config(city_name, device_ip, branch_ip_subnet="10.50"):
-    """Generate router configuration"""
-    hostname = f"{city_name}-RTR-01"
-    wan_ip = f"{branch_ip_subnet}.1.1"
-    lan_ip = f"{branch_ip_subnet}.10.1"
-    
-    config = f"""!
-! Router Configuration for {hostname}
-! Device IP: {device_ip}
-! Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+# Config templates are built once when the script loads,
+# each device only fills in its own values
+ROUTER_TEMPLATE = Template("""!
+! Router Configuration for ${hostname}
+! Device IP: ${device_ip}
+! Generated: ${generated}
 !
-hostname {hostname}
+hostname ${hostname}
 !
 ! WAN Interface
 interface GigabitEthernet0/0
  description WAN Interface to ISP
- ip address {wan_ip} 255.255.255.252
+ ip address ${wan_ip} 255.255.255.252
  no shutdown
 !
 ! LAN Interface
 interface GigabitEthernet0/1
  description LAN Interface to Switch
- ip address {lan_ip} 255.255.255.0
+ ip address ${lan_ip} 255.255.255.0
  no shutdown
 !
 ! Default Route
-ip route 0.0.0.0 0.0.0.0 {branch_ip_subnet}.1.2
+ip route 0.0.0.0 0.0.0.0 ${subnet}.1.2
 !
 ! Enable SSH
-ip domain-name {city_name.lower()}.local
+ip domain-name ${domain}.local
 crypto key generate rsa modulus 2048
 ip ssh version 2
 !
@@ -83,23 +54,14 @@ username admin privilege 15 secret 0 YourSecurePassword123!
 ! Save Configuration
 end
 write memory
-!"""
-    
-    return config, hostname
-
+!""")
 
-def generate_switch_config(city_name, device_ip, branch_ip_subnet="10.50"):
-    """Generate switch configuration"""
-    hostname = f"{city_name}-SW-01"
-    mgmt_ip = f"{branch_ip_subnet}.10.2"
-    gateway_ip = f"{branch_ip_subnet}.10.1"
-    
-    config = f"""!
-! Switch Configuration for {hostname}
-! Device IP: {device_ip}
-! Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+SWITCH_TEMPLATE = Template("""!
+! Switch Configuration for ${hostname}
+! Device IP: ${device_ip}
+! Generated: ${generated}
 !
-hostname {hostname}
+hostname ${hostname}
 !
 ! VLANs
 vlan 10
@@ -117,11 +79,11 @@ vlan 40
 ! Management Interface
 interface Vlan10
  description Management VLAN
- ip address {mgmt_ip} 255.255.255.0
+ ip address ${mgmt_ip} 255.255.255.0
  no shutdown
 !
 ! Default Gateway
-ip default-gateway {gateway_ip}
+ip default-gateway ${gateway_ip}
 !
 ! User Ports (1-20)
 interface range GigabitEthernet1/0/1-20
@@ -153,7 +115,7 @@ interface GigabitEthernet1/0/48
  switchport trunk allowed vlan 10,20,30,40
 !
 ! Enable SSH
-ip domain-name {city_name.lower()}.local
+ip domain-name ${domain}.local
 crypto key generate rsa modulus 2048
 ip ssh version 2
 !
@@ -168,7 +130,54 @@ username admin privilege 15 secret 0 YourSecurePassword123!
 ! Save Configuration
 end
 write memory
-!"""
+!""")
+
+
+def read_hosts_file(filename='hosts.txt'):
+    """Read device information from hosts.txt file"""
+    try:
+        # Only the IP address is needed for config generation
+        devices = [{'ip': ip} for ip in load_host_ips(filename)]
+    except FileNotFoundError:
+        print(f"⚠️  Warning: {filename} not found. Using example devices.")
+        # Example devices if no hosts file
+        devices = [
+            {'ip': '10.50.1.1'},
+            {'ip': '10.50.10.2'}
+        ]
+    
+    return devices
+
+
+def generate_router_config(city_name, device_ip, branch_ip_subnet="10.50", generated=None):
+    """Generate router configuration"""
+    hostname = f"{city_name}-RTR-01"
+    
+    config = ROUTER_TEMPLATE.substitute(
+        hostname=hostname,
+        device_ip=device_ip,
+        generated=generated or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        wan_ip=f"{branch_ip_subnet}.1.1",
+        lan_ip=f"{branch_ip_subnet}.10.1",
+        subnet=branch_ip_subnet,
+        domain=city_name.lower()
+    )
+    
+    return config, hostname
+
+
+def generate_switch_config(city_name, device_ip, branch_ip_subnet="10.50", generated=None):
+    """Generate switch configuration"""
+    hostname = f"{city_name}-SW-01"
+    
+    config = SWITCH_TEMPLATE.substitute(
+        hostname=hostname,
+        device_ip=device_ip,
+        generated=generated or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        mgmt_ip=f"{branch_ip_subnet}.10.2",
+        gateway_ip=f"{branch_ip_subnet}.10.1",
+        domain=city_name.lower()
+    )
     
     return config, hostname
 
@@ -180,15 +189,18 @@ def configure_branch_office(city_name, branch_ip_subnet="10.50"):
     print(f"📍 Location: {city_name}")
     print(f"🌐 IP Subnet: {branch_ip_subnet}.0.0/16")
     print(f"{'='*60}")
-    print(f"📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # One timestamp for the whole run
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"📅 Generated: {generated}")
     
     # Read devices from hosts file
     devices = read_hosts_file()
     
     print(f"\n📋 Found {len(devices)} devices")
     
-    # Generate configurations
-    configs_generated = 0
+    # Generate configurations (saved together after the loop)
+    configs = []
     
     for i, device in enumerate(devices):
         device_num = i + 1
@@ -197,47 +209,57 @@ def configure_branch_office(city_name, branch_ip_subnet="10.50"):
         if device_num % 2 == 1:
             # Router
             print(f"\n📡 Generating ROUTER configuration #{device_num//2 + 1}")
-            config, hostname = generate_router_config(city_name, device['ip'], branch_ip_subnet)
+            config, hostname = generate_router_config(city_name, device['ip'], branch_ip_subnet, generated)
             filename = f"{city_name}_router_{device_num//2 + 1}_config.txt"
         else:
             # Switch
             print(f"\n🔌 Generating SWITCH configuration #{device_num//2}")
-            config, hostname = generate_switch_config(city_name, device['ip'], branch_ip_subnet)
+            config, hostname = generate_switch_config(city_name, device['ip'], branch_ip_subnet, generated)
             filename = f"{city_name}_switch_{device_num//2}_config.txt"
         
-        # Save configuration
-        with open(filename, 'w') as f:
-            f.write(config)
+        configs.append((filename, config))
         
         print(f"   ✅ Generated: {filename}")
         print(f"   📋 Hostname: {hostname}")
         print(f"   🌐 Device IP: {device['ip']}")
-        configs_generated += 1
+    
+    # Save all configurations into one archive, in a single pass,
+    # instead of creating a separate file for every device
+    archive_filename = f"{city_name}_configs.tar"
+    with tarfile.open(archive_filename, 'w') as archive:
+        for filename, config in configs:
+            data = config.encode()
+            member = tarfile.TarInfo(filename)
+            member.size = len(data)
+            member.mtime = time.time()
+            archive.addfile(member, io.BytesIO(data))
+    configs_generated = len(configs)
     
     # Generate summary file
     summary_filename = f"{city_name}_deployment_summary.txt"
+    summary = [
+        f"Branch Office Deployment Summary\n",
+        f"{'='*40}\n",
+        f"Location: {city_name}\n",
+        f"Generated: {generated}\n",
+        f"IP Subnet: {branch_ip_subnet}.0.0/16\n\n",
+        f"Network Design:\n",
+        f"  WAN Subnet: {branch_ip_subnet}.1.0/30\n",
+        f"  LAN Subnet: {branch_ip_subnet}.10.0/24\n",
+        f"  Router LAN IP: {branch_ip_subnet}.10.1\n",
+        f"  Switch MGMT IP: {branch_ip_subnet}.10.2\n\n",
+        f"VLANs:\n",
+        f"  VLAN 10: Management\n",
+        f"  VLAN 20: Users\n",
+        f"  VLAN 30: Printers\n",
+        f"  VLAN 40: Guest\n\n",
+        f"Generated Files (in {archive_filename}):\n",
+    ]
+    for filename, config in configs:
+        summary.append(f"  - {filename}\n")
+    
     with open(summary_filename, 'w') as f:
-        f.write(f"Branch Office Deployment Summary\n")
-        f.write(f"{'='*40}\n")
-        f.write(f"Location: {city_name}\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"IP Subnet: {branch_ip_subnet}.0.0/16\n\n")
-        f.write(f"Network Design:\n")
-        f.write(f"  WAN Subnet: {branch_ip_subnet}.1.0/30\n")
-        f.write(f"  LAN Subnet: {branch_ip_subnet}.10.0/24\n")
-        f.write(f"  Router LAN IP: {branch_ip_subnet}.10.1\n")
-        f.write(f"  Switch MGMT IP: {branch_ip_subnet}.10.2\n\n")
-        f.write(f"VLANs:\n")
-        f.write(f"  VLAN 10: Management\n")
-        f.write(f"  VLAN 20: Users\n")
-        f.write(f"  VLAN 30: Printers\n")
-        f.write(f"  VLAN 40: Guest\n\n")
-        f.write(f"Generated Files:\n")
-        for i in range(configs_generated):
-            if i % 2 == 0:
-                f.write(f"  - {city_name}_router_{i//2 + 1}_config.txt\n")
-            else:
-                f.write(f"  - {city_name}_switch_{i//2 + 1}_config.txt\n")
+        f.write("".join(summary))
     
     # Summary
     print(f"\n{'='*60}")
@@ -245,15 +267,12 @@ def configure_branch_office(city_name, branch_ip_subnet="10.50"):
     print(f"{'='*60}")
     print(f"✅ Generated {configs_generated} configurations")
     print(f"📄 Summary saved to: {summary_filename}")
-    print(f"\n📁 Generated files:")
-    for i in range(configs_generated):
-        if i % 2 == 0:
-            print(f"   - {city_name}_router_{i//2 + 1}_config.txt")
-        else:
-            print(f"   - {city_name}_switch_{i//2 + 1}_config.txt")
-    print(f"   - {summary_filename}")
+    print(f"📦 Configurations saved to: {archive_filename}")
+    print(f"\n📁 Files in {archive_filename}:")
+    for filename, config in configs:
+        print(f"   - {filename}")
     print(f"\n💡 Next steps:")
-    print(f"   1. Review the generated configurations")
+    print(f"   1. Extract (tar -xf {archive_filename}) and review the configurations")
     print(f"   2. Update passwords and secrets")
     print(f"   3. Copy/paste configs to devices via console")
     print(f"{'='*60}\n")
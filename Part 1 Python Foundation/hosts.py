@@ -0,0 +1,99 @@
+"""
+hosts.txt reader shared by the Part 1 scripts
+Format: ip_address,username,password,device_type
+Also looks up devices that are listed by name instead of IP address
+"""
+
+import asyncio
+import ipaddress
+import logging
+import mmap
+import re
+import socket
+
+# One line of hosts.txt. The whole file is scanned with this one regex,
+# no per-line Python code. Comments (#) and empty lines never match.
+# Lines with only an IP address still match, with no credentials.
+HOSTS_RE = re.compile(
+    rb"^[ \t]*([^#,\s][^,\r\n]*?)[ \t]*"                 # ip_address
+    rb"(?:,[ \t]*([^,\r\n]*?)[ \t]*"                     # username
+    rb",[ \t]*([^,\r\n]*?)[ \t]*"                        # password
+    rb",[ \t]*([^,\r\n]*?)[ \t]*)?"                      # device_type
+    rb"(?:,[^\r\n]*)?\r?$",                              # anything extra
+    re.MULTILINE
+)
+
+
+def scan_hosts_file(filename):
+    """
+    Return (line_number, ip, username, password, device_type) for every
+    usable line of the hosts file. The credentials are None on lines that
+    don't have all four fields.
+    """
+    with open(filename, 'rb') as f:
+        # mmap can't map an empty file
+        if f.seek(0, 2) == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            entries = []
+            line_number, counted_to = 1, 0
+            for match in HOSTS_RE.finditer(mm):
+                # Count the newlines since the last match to know the line
+                line_number += mm[counted_to:match.start()].count(b"\n")
+                counted_to = match.start()
+                fields = (field.decode() if field is not None else None for field in match.groups())
+                entries.append((line_number, *fields))
+            return entries
+
+
+def load_hosts(filename='hosts.txt'):
+    """Read the complete device entries (all four fields) from the hosts file"""
+    devices = []
+    for line_number, ip, username, password, device_type in scan_hosts_file(filename):
+        # Say so when a line is missing fields, or that switch is silently left out
+        if device_type is None:
+            logging.warning(f"Line {line_number}: Skipping incomplete entry ({ip})")
+            continue
+        devices.append({'ip': ip, 'username': username, 'password': password, 'device_type': device_type})
+    return devices
+
+
+def load_host_ips(filename='hosts.txt'):
+    """Read just the IP address from every line of the hosts file"""
+    return [ip for _, ip, *_ in scan_hosts_file(filename)]
+
+
+# Addresses for devices listed by name in hosts.txt, looked up once per run
+resolved_addresses = {}
+
+
+async def resolve_hostnames(devices):
+    """Look up all device hostnames at the same time, before connecting"""
+    loop = asyncio.get_running_loop()
+    names = {device['ip'] for device in devices if not is_ip_address(device['ip'])}
+    names = [name for name in names if name not in resolved_addresses]
+
+    answers = await asyncio.gather(
+        *[loop.getaddrinfo(name, None, type=socket.SOCK_STREAM) for name in names],
+        return_exceptions=True
+    )
+
+    for name, answer in zip(names, answers):
+        # Unresolvable names are left alone, the connect will report them
+        if not isinstance(answer, Exception):
+            resolved_addresses[name] = answer[0][4][0]
+
+
+def is_ip_address(value):
+    """True if value is already an IP address, not a hostname"""
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def device_address(device):
+    """Address to connect to for this device"""
+    return resolved_addresses.get(device['ip'], device['ip'])
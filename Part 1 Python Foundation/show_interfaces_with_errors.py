@@ -6,28 +6,26 @@ Simple, reliable, and gets the job done!
 """
 
 from netmiko import ConnectHandler
+from hosts import load_hosts, resolve_hostnames, device_address
 from datetime import datetime
+import asyncio
+import re
 import sys
 
+# Both checks are sent to the device in a single write (see below).
+# This command works on most Cisco devices
+ERROR_COMMAND = 'show interfaces | include line protocol|input errors|output errors|CRC'
+STATUS_COMMAND = 'show ip interface brief | exclude unassigned'
+
+# Compiled once, then run over the whole command output.
+# Matches either an interface line ("Gi1/0/1 is up, line protocol is up")
+# or its error line ("     12345 input errors, 0 CRC, 0 frame...")
+INTERFACE_ERRORS_RE = re.compile(r"^(\S+) is .*line protocol|^[ \t]*(\d+) input errors", re.MULTILINE)
+
 def read_hosts_file(filename='hosts.txt'):
     """Read device information from hosts.txt file"""
-    devices = []
     try:
-        with open(filename, 'r') as file:
-            for line in file:
-                # Skip comments and empty lines
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Split the line: ip,username,password,device_type
-                    parts = line.split(',')
-                    if len(parts) == 4:
-                        device = {
-                            'ip': parts[0].strip(),
-                            'username': parts[1].strip(),
-                            'password': parts[2].strip(),
-                            'device_type': parts[3].strip()
-                        }
-                        devices.append(device)
+        devices = load_hosts(filename)
     except FileNotFoundError:
         print(f"ERROR: Cannot find {filename}")
         print("Make sure hosts.txt is in the same folder as this script")
@@ -35,7 +33,70 @@ def read_hosts_file(filename='hosts.txt'):
     
     return devices
 
-def show_interfaces_with_errors(error_threshold=100):
+def check_device(device_info, error_threshold):
+    """
+    Check one device for interface errors and down interfaces
+    Runs in a worker thread, returns (hostname, problems, down_interfaces)
+    """
+    # Make SSH connection using Netmiko
+    # fast_cli keeps Netmiko's sleeps between reads short
+    connection = ConnectHandler(**{**device_info, 'ip': device_address(device_info)}, fast_cli=True)
+    
+    try:
+        # Netmiko already read the prompt when it logged in
+        hostname = connection.base_prompt
+        
+        # Send both commands in one go and read everything back once,
+        # instead of waiting for the prompt after each command
+        output = connection.send_command_timing(f"{ERROR_COMMAND}\n{STATUS_COMMAND}")
+    finally:
+        connection.disconnect()
+    
+    # The status output starts at the prompt that echoes the second command
+    prompt_re = re.compile(rf"^{re.escape(hostname)}[#>]", re.MULTILINE)
+    output, int_status = (prompt_re.split(output, maxsplit=1) + [''])[:2]
+    
+    # Parse the output
+    problems = []
+    current_interface = None
+    
+    for match in INTERFACE_ERRORS_RE.finditer(output):
+        interface, errors = match.groups()
+        
+        # Interface line - remember which interface we are on
+        if interface:
+            current_interface = interface
+        
+        # Error line - only report if above threshold
+        elif current_interface and int(errors) > error_threshold:
+            problems.append((current_interface, int(errors)))
+    
+    # Also check interface status for down interfaces
+    down_interfaces = [
+        line.strip()
+        for line in int_status.split('\n')[2:]  # Skip command echo and header
+        if line and 'down' in line.lower()
+    ]
+    
+    return hostname, problems, down_interfaces
+
+async def check_one(device_info, error_threshold, semaphore):
+    """Check one device without blocking the others"""
+    async with semaphore:
+        return await asyncio.to_thread(check_device, device_info, error_threshold)
+
+async def check_all_devices(devices, error_threshold, max_workers):
+    """Check all devices at the same time, at most max_workers at once"""
+    # Resolve hostnames up front instead of once per connection
+    await resolve_hostnames(devices)
+    
+    semaphore = asyncio.Semaphore(max_workers)
+    return await asyncio.gather(
+        *[check_one(device_info, error_threshold, semaphore) for device_info in devices],
+        return_exceptions=True
+    )
+
+def show_interfaces_with_errors(error_threshold=100, max_workers=10):
     """
     Connect to multiple switches and check interface errors
     Just like 'show interface | include errors' but better!
@@ -58,66 +119,37 @@ def show_interfaces_with_errors(error_threshold=100):
     # Track if we found any problems
     total_problems = 0
     
-    # Connect to each device
-    for device_info in devices:
-        print(f"Connecting to {device_info['ip']}...", end='', flush=True)
+    # Connect to all devices in parallel
+    print(f"Checking up to {max_workers} devices at a time...\n")
+    results = asyncio.run(check_all_devices(devices, error_threshold, max_workers))
+    
+    # Show results in the same order as hosts.txt
+    for device_info, result in zip(devices, results):
+        print(f"Device {device_info['ip']}...", end='')
         
-        try:
-            # Make SSH connection using Netmiko
-            connection = ConnectHandler(**device_info)
-            print(" [CONNECTED]")
-            
-            # Get hostname for better output
-            hostname = connection.find_prompt()[:-1]  # Remove # or > from prompt
-            
-            # Run command to check interface errors
-            # This command works on most Cisco devices
-            output = connection.send_command('show interfaces | include line protocol|input errors|output errors|CRC')
-            
-            # Parse the output
-            lines = output.split('\n')
-            current_interface = None
-            
-            for line in lines:
-                # Check if this is an interface line
-                if 'line protocol' in line:
-                    # Extract interface name
-                    current_interface = line.split()[0]
-                
-                # Check for error lines
-                elif 'input errors' in line and current_interface:
-                    # Extract error count
-                    # Line format: "     12345 input errors, 0 CRC, 0 frame..."
-                    parts = line.strip().split()
-                    if parts and parts[0].isdigit():
-                        error_count = int(parts[0])
-                        
-                        # Only show if above threshold
-                        if error_count > error_threshold:
-                            print(f"\n  PROBLEM FOUND on {hostname}")
-                            print(f"  Interface: {current_interface}")
-                            print(f"  Input Errors: {error_count}")
-                            print(f"  Action: Check physical connection/cable/SFP")
-                            total_problems += 1
-            
-            # Also check interface status for down interfaces
-            int_status = connection.send_command('show ip interface brief | exclude unassigned')
-            print(f"\n  Quick Interface Status for {hostname}:")
-            print("  " + "-"*40)
-            
-            for line in int_status.split('\n')[1:]:  # Skip header
-                if line and 'down' in line.lower():
-                    print(f"  WARNING: {line.strip()}")
-            
-            # Disconnect
-            connection.disconnect()
-            print(f"  Disconnected from {hostname}\n")
-            
-        except Exception as e:
+        if isinstance(result, Exception):
             print(f" [FAILED]")
-            print(f"  Error: {str(e)}")
+            print(f"  Error: {str(result)}")
             print(f"  Check: IP reachability, credentials, SSH enabled\n")
             continue
+        
+        hostname, problems, down_interfaces = result
+        print(" [CONNECTED]")
+        
+        for interface, error_count in problems:
+            print(f"\n  PROBLEM FOUND on {hostname}")
+            print(f"  Interface: {interface}")
+            print(f"  Input Errors: {error_count}")
+            print(f"  Action: Check physical connection/cable/SFP")
+            total_problems += 1
+        
+        print(f"\n  Quick Interface Status for {hostname}:")
+        print("  " + "-"*40)
+        
+        for line in down_interfaces:
+            print(f"  WARNING: {line}")
+        
+        print(f"  Disconnected from {hostname}\n")
     
     # Summary
     print("\n" + "="*60)
@@ -141,4 +173,11 @@ def main():
     # show_interfaces_with_errors(error_threshold=0)
 
 if __name__ == "__main__":
+    # uvloop is a faster event loop (Linux/macOS) - use it if it's installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     main()
\ No newline at end of file
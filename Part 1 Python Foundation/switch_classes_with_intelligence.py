@@ -6,6 +6,97 @@ More realistic switch behavior with proper networking practices
 # This helps manage switch configs without complex coding
 """
 
+from functools import lru_cache
+
+# Parts of the generated config that are the same for every switch
+CONFIG_HEADER = """!
+! Switch Configuration - {hostname}
+! Generated: {generated}
+!
+service password-encryption
+service timestamps log datetime msec
+!
+hostname {hostname}
+!
+spanning-tree mode rapid-pvst
+spanning-tree extend system-id
+!
+! VLANs
+"""
+
+CONFIG_FOOTER = """!
+! AAA and Security
+aaa new-model
+!
+ip domain-name local.net
+crypto key generate rsa modulus 2048
+ip ssh version 2
+ip ssh time-out 60
+!
+line con 0
+ logging synchronous
+ exec-timeout 15 0
+line vty 0 15
+ transport input ssh
+ exec-timeout 15 0
+!
+! DHCP Snooping
+ip dhcp snooping
+ip dhcp snooping vlan 10,20,30
+no ip dhcp snooping information option
+!
+end
+"""
+
+@lru_cache(maxsize=256)
+def interface_config(settings_items):
+    """
+    Config lines for one interface (everything after 'interface ...').
+    Ports with the same settings share one cached result, so the 40-odd
+    unused ports of a switch are only worked out once.
+    """
+    settings = dict(settings_items)
+    parts = []
+    
+    if settings.get("description"):
+        parts.append(f" description {settings['description']}\n")
+    
+    # Speed and duplex
+    parts.append(f" speed {settings.get('speed', 'auto')}\n duplex {settings.get('duplex', 'auto')}\n")
+    
+    if settings["mode"] == "access":
+        parts.append(f" switchport mode access\n switchport access vlan {settings['vlan']}\n")
+    
+        # Port security for access ports
+        if settings.get("port_security"):
+            parts.append(
+                " switchport port-security\n"
+                f" switchport port-security maximum {settings.get('max_mac', 2)}\n"
+                " switchport port-security violation restrict\n"
+                " switchport port-security aging time 5\n"
+            )
+    
+        # Only portfast on access ports!
+        parts.append(" spanning-tree portfast\n spanning-tree bpduguard enable\n")
+    
+    elif settings["mode"] == "trunk":
+        parts.append(
+            " switchport trunk encapsulation dot1q\n"
+            " switchport mode trunk\n"
+            f" switchport trunk native vlan {settings.get('native_vlan', 1)}\n"
+        )
+    
+        if settings.get("allowed_vlans") != "all":
+            parts.append(f" switchport trunk allowed vlan {settings['allowed_vlans']}\n")
+    
+    # Shutdown status
+    if settings["status"] == "up":
+        parts.append(" no shutdown\n!\n")
+    else:
+        parts.append(" shutdown\n!\n")
+    
+    return "".join(parts)
+
 class Switch:
     def __init__(self, hostname, management_ip, management_vlan=10):
         self.hostname = hostname
@@ -155,103 +246,33 @@ class Switch:
             print(f"❌ Bad IP address: {self.management_ip}")
             return None
         
-        config = f"""!
-! Switch Configuration - {self.hostname}
-! Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-!
-service password-encryption
-service timestamps log datetime msec
-!
-hostname {self.hostname}
-!
-spanning-tree mode rapid-pvst
-spanning-tree extend system-id
-!
-! VLANs
-"""
+        parts = [CONFIG_HEADER.format(
+            hostname=self.hostname,
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )]
+        
         # Add VLANs
         for vlan_id, vlan_info in self.vlans.items():
             if vlan_id != 1:
-                config += f"""vlan {vlan_id}
- name {vlan_info['name']}
-!
-"""
+                parts.append(f"vlan {vlan_id}\n name {vlan_info['name']}\n!\n")
         
         # Management interface (NOT VLAN 1!)
-        config += f"""!
+        parts.append(f"""!
 interface Vlan{self.management_vlan}
  description Management Interface
  ip address {self.management_ip} 255.255.255.0
  no shutdown
 !
-"""
+""")
         
         # Configure interfaces
         for interface, settings in self.interfaces.items():
-            config += f"interface {interface}\n"
-            
-            if settings.get("description"):
-                config += f" description {settings['description']}\n"
-            
-            # Speed and duplex
-            config += f" speed {settings.get('speed', 'auto')}\n"
-            config += f" duplex {settings.get('duplex', 'auto')}\n"
-            
-            if settings["mode"] == "access":
-                config += f" switchport mode access\n"
-                config += f" switchport access vlan {settings['vlan']}\n"
-                
-                # Port security for access ports
-                if settings.get("port_security"):
-                    config += " switchport port-security\n"
-                    config += f" switchport port-security maximum {settings.get('max_mac', 2)}\n"
-                    config += " switchport port-security violation restrict\n"
-                    config += " switchport port-security aging time 5\n"
-                
-                # Only portfast on access ports!
-                config += " spanning-tree portfast\n"
-                config += " spanning-tree bpduguard enable\n"
-                
-            elif settings["mode"] == "trunk":
-                config += " switchport trunk encapsulation dot1q\n"
-                config += " switchport mode trunk\n"
-                config += f" switchport trunk native vlan {settings.get('native_vlan', 1)}\n"
-                
-                if settings.get("allowed_vlans") != "all":
-                    config += f" switchport trunk allowed vlan {settings['allowed_vlans']}\n"
-            
-            # Shutdown status
-            if settings["status"] == "up":
-                config += " no shutdown\n"
-            else:
-                config += " shutdown\n"
-            
-            config += "!\n"
+            parts.append(f"interface {interface}\n")
+            parts.append(interface_config(tuple(settings.items())))
         
         # Security and access
-        config += """!
-! AAA and Security
-aaa new-model
-!
-ip domain-name local.net
-crypto key generate rsa modulus 2048
-ip ssh version 2
-ip ssh time-out 60
-!
-line con 0
- logging synchronous
- exec-timeout 15 0
-line vty 0 15
- transport input ssh
- exec-timeout 15 0
-!
-! DHCP Snooping
-ip dhcp snooping
-ip dhcp snooping vlan 10,20,30
-no ip dhcp snooping information option
-!
-end
-"""
+        parts.append(CONFIG_FOOTER)
+        config = "".join(parts)
         
         filename = f"{self.hostname}_config.txt"
         try:
@@ -1,5 +1,8 @@
 import asyncio
-import subprocess
+import ipaddress
+import icmplib
+import socket
+import sys
 import time
 from datetime import datetime
 
@@ -12,27 +15,82 @@ devices = [
     "8.8.4.4",        # Google DNS 2
 ]
 
+# Port for the TCP check, used when this system doesn't allow ICMP
+# sockets without root. 22 (SSH) is open on most routers and switches.
+TCP_CHECK_PORT = 22
+
+# Longest we wait for one device, so one slow device can't stretch the round
+PING_TIMEOUT = 3
+
+# How long we remember a DNS answer (seconds)
+DNS_CACHE_SECONDS = 60
+
+# hostname -> (ip address, when we looked it up)
+resolved = {}
+
+async def resolve_host(host):
+    """
+    Turn a hostname into an IP address
+    The answer is remembered for DNS_CACHE_SECONDS, so we don't
+    ask DNS again on every check
+    """
+    # Already an IP address (IPv4 or IPv6) - nothing to look up
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    
+    cached = resolved.get(host)
+    if cached and time.monotonic() - cached[1] < DNS_CACHE_SECONDS:
+        return cached[0]
+    
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    address = infos[0][4][0]
+    
+    resolved[host] = (address, time.monotonic())
+    return address
+
+async def tcp_check(device_ip):
+    """
+    Check if a device answers on TCP - no ping needed
+    Any answer, even 'connection refused', means the device is up
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(device_ip, TCP_CHECK_PORT),
+            timeout=1
+        )
+        writer.close()
+        await writer.wait_closed()
+        return True
+    except ConnectionRefusedError:
+        return True
+    except (asyncio.TimeoutError, OSError):
+        return False
+
 async def ping_device(device_ip):
     """
     This function pings one device
     It's async so it doesn't block other pings
     """
-    # We will try to ping 2 times
-    ping_command = ["ping", "-c", "2", "-W", "1", device_ip]
-    
     try:
-        # Run ping command
-        process = await asyncio.create_subprocess_exec(
-            *ping_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        # Names like "router1.lab" are looked up once a minute, not every round
+        address = await resolve_host(device_ip)
         
-        # Wait for ping to finish
-        stdout, stderr = await process.communicate()
+        try:
+            # We will try to ping 2 times, waiting up to 1 second for each reply
+            # icmplib sends the pings from Python itself - no ping process to start
+            # privileged=False means it works without root
+            host = await icmplib.async_ping(address, count=2, timeout=1, privileged=False)
+            is_up = host.is_alive
+        except icmplib.SocketPermissionError:
+            # ICMP without root is turned off on this system - use TCP instead
+            is_up = await tcp_check(address)
         
-        # Check if ping worked (return code 0 means success)
-        if process.returncode == 0:
+        # Any reply means the device is up
+        if is_up:
             return f"✅ {device_ip} is UP"
         else:
             return f"❌ {device_ip} is DOWN"
@@ -41,6 +99,13 @@ async def ping_device(device_ip):
         # Something went wrong
         return f"⚠️  {device_ip} ERROR: {str(e)}"
 
+async def bounded(device_ip, timeout=PING_TIMEOUT):
+    """Ping one device, but give up after timeout seconds"""
+    try:
+        return await asyncio.wait_for(ping_device(device_ip), timeout)
+    except asyncio.TimeoutError:
+        return f"⌛ {device_ip} TIMEOUT (no answer in {timeout}s)"
+
 async def monitor_all_devices():
     """
     This function monitors all devices at the same time
@@ -52,27 +117,24 @@ async def monitor_all_devices():
     # Start timer to see how fast we are
     start_time = time.time()
     
-    # Create tasks for all devices at once
+    # Ping all devices at once and wait for all pings to complete
     # This is like asking 5 people to do work at same time
-    tasks = []
-    for device in devices:
-        task = asyncio.create_task(ping_device(device))
-        tasks.append(task)
-    
-    # Wait for all pings to complete
-    results = await asyncio.gather(*tasks)
-    
-    # Show results
-    print("📋 PING RESULTS:")
-    print("-" * 40)
-    for result in results:
-        print(result)
+    # (gather schedules the coroutines itself, no need to make tasks first)
+    results = await asyncio.gather(*(bounded(device) for device in devices))
     
     # Show how long it took
     total_time = time.time() - start_time
-    print("-" * 40)
-    print(f"⏱️  Total time: {total_time:.2f} seconds")
-    print(f"💡 Without asyncio, this would take ~{len(devices) * 2} seconds!")
+    
+    # Show results - all lines written in one go, not one print per device
+    report = [
+        "📋 PING RESULTS:",
+        "-" * 40,
+        *results,
+        "-" * 40,
+        f"⏱️  Total time: {total_time:.2f} seconds",
+        f"💡 Without asyncio, this would take ~{len(devices) * 2} seconds!",
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
 
 async def main():
     """
@@ -96,4 +158,11 @@ async def main():
 
 # This is where program starts
 if __name__ == "__main__":
+    # uvloop is a faster event loop (Linux/macOS) - use it if it's installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,124 @@
+
+import asyncio
+import ipaddress
+import socket
+import sys
+import time
+
+# Hosts and ports to check
+targets = [
+    {"host": "google.com", "port": 80},      # HTTP
+    {"host": "google.com", "port": 443},     # HTTPS  
+    {"host": "8.8.8.8", "port": 53},         # DNS
+    {"host": "github.com", "port": 22},      # SSH
+    {"host": "1.1.1.1", "port": 53},         # DNS
+    {"host": "example.com", "port": 80},     # HTTP
+]
+
+# How many ports we check at the same time
+MAX_CHECKS = 64
+
+# How long we remember a DNS answer (seconds)
+DNS_CACHE_SECONDS = 60
+
+# hostname -> (ip address, when we looked it up)
+resolved = {}
+
+async def resolve_host(host):
+    """
+    Turn a hostname into an IP address
+    The answer is remembered for DNS_CACHE_SECONDS, so we don't
+    ask DNS again on every check
+    """
+    # Already an IP address (IPv4 or IPv6) - nothing to look up
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    
+    cached = resolved.get(host)
+    if cached and time.monotonic() - cached[1] < DNS_CACHE_SECONDS:
+        return cached[0]
+    
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    address = infos[0][4][0]
+    
+    resolved[host] = (address, time.monotonic())
+    return address
+
+async def check_port(host, port):
+    """
+    Check if a port is open on a host
+    """
+    try:
+        address = await resolve_host(host)
+        
+        # Connect without blocking - other checks keep running meanwhile
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(address, port),
+            timeout=3
+        )
+        writer.close()
+        await writer.wait_closed()
+        return f"✅ {host}:{port} is OPEN"
+        
+    except socket.gaierror as e:
+        # The name doesn't exist - that's not the same as a closed port
+        return f"⚠️  {host}:{port} ERROR: {str(e)}"
+    except (asyncio.TimeoutError, OSError):
+        # Timed out, refused or unreachable
+        return f"❌ {host}:{port} is CLOSED"
+    except Exception as e:
+        return f"⚠️  {host}:{port} ERROR: {str(e)}"
+
+async def check_all_ports():
+    """
+    Check all ports concurrently
+    """
+    print(f"🔍 Checking {len(targets)} ports...\n")
+    
+    start_time = time.time()
+    
+    # Only MAX_CHECKS connections open at the same time
+    semaphore = asyncio.Semaphore(MAX_CHECKS)
+    
+    async def limited_check(host, port):
+        async with semaphore:
+            return await check_port(host, port)
+    
+    # Run all checks and wait for them
+    results = await asyncio.gather(
+        *(limited_check(target["host"], target["port"]) for target in targets)
+    )
+    
+    total_time = time.time() - start_time
+    
+    # Show results - all lines written in one go, not one print per port
+    report = [
+        "📋 PORT CHECK RESULTS:",
+        "-" * 40,
+        *results,
+        "-" * 40,
+        f"⏱️  Total time: {total_time:.2f} seconds",
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
+
+# BUG #4: Wrong way to run asyncio
+if __name__ == "__main__":
+    # uvloop is a faster event loop (Linux/macOS) - use it if it's installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    print("🌐 Async Port Checker")
+    print("=" * 40 + "\n")
+    
+    # asyncio.run creates the event loop, runs the coroutine and closes the loop
+    asyncio.run(check_all_ports())
+    
+    print("\n✅ Done!")
+
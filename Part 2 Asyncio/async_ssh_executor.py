@@ -1,5 +1,9 @@
+import aiofiles
 import asyncio
 import asyncssh
+import orjson
+import os
+import sys
 import time
 from datetime import datetime
 
@@ -12,6 +16,18 @@ devices = [
     # For 500+ devices, you can read from a CSV file
 ]
 
+def device_columns(device_list):
+    """
+    Split the device list into three tuples: hosts, usernames, passwords
+    Position i in each tuple is the same device, so the loops below
+    just zip them together - no dictionary lookups per device
+    """
+    if not device_list:
+        return (), (), ()
+    return tuple(zip(*((d["host"], d["username"], d["password"]) for d in device_list)))
+
+HOSTS, USERS, PASSWORDS = device_columns(devices)
+
 # Commands to run on each device
 commands = [
     "show version",
@@ -19,43 +35,183 @@ commands = [
     "show running-config",
 ]
 
-async def run_commands_on_device(device_info):
+# How many devices we talk to at the same time
+# Too many at once runs out of file handles and floods the network
+MAX_CONNECTIONS = 64
+
+# Longest we wait for one device before giving up on it (seconds)
+DEVICE_TIMEOUT = 30
+
+# Path to a known_hosts file to check device SSH keys against.
+# None = don't check keys (fine for a lab, be careful in production!)
+KNOWN_HOSTS_FILE = None
+
+# Parsed known_hosts file, kept so we don't read it again for every device
+known_hosts_cache = {"mtime": None, "known_hosts": None}
+
+def get_known_hosts():
     """
-    Connect to one device and run commands
-    This is async - it won't block other devices
+    Return the parsed known_hosts to pass to asyncssh.connect
+    The file is read once and only read again when it changes
     """
-    host = device_info["host"]
+    if KNOWN_HOSTS_FILE is None:
+        return None
     
-    try:
-        # Connect to device using SSH
-        async with asyncssh.connect(
-            host=host,
-            username=device_info["username"],
-            password=device_info["password"],
-            known_hosts=None,  # Don't check SSH keys (be careful in production!)
-        ) as conn:
+    mtime = os.path.getmtime(KNOWN_HOSTS_FILE)
+    if known_hosts_cache["mtime"] != mtime:
+        known_hosts_cache["known_hosts"] = asyncssh.read_known_hosts(KNOWN_HOSTS_FILE)
+        known_hosts_cache["mtime"] = mtime
+    
+    return known_hosts_cache["known_hosts"]
+
+class AsyncSSHPool:
+    """
+    Keeps SSH connections open between runs
+    Logging in (key exchange + password) is the slow part of SSH,
+    so we do it once per device and reuse the connection after that
+    Commands don't need a connection each - asyncssh runs every
+    command on its own channel inside the one connection
+    """
+    
+    def __init__(self, idle_timeout=300, max_age=3600):
+        self.idle_timeout = idle_timeout  # Close if unused this long (seconds)
+        self.max_age = max_age            # Reconnect after this long anyway
+        self.connections = {}             # (host, username) -> connection info
+        self.locks = {}                   # (host, username) -> asyncio.Lock
+        self.cleanup_task = None
+    
+    async def acquire(self, host, username, password):
+        """Get a connection to the device - an open one if we have it"""
+        key = (host, username)
+        
+        # One lock per device, so devices still connect in parallel
+        # (created here, not in __init__, so it belongs to the running event loop)
+        if key not in self.locks:
+            self.locks[key] = asyncio.Lock()
+        
+        async with self.locks[key]:
+            now = time.monotonic()
+            entry = self.connections.get(key)
+            
+            # Throw away connections that died or are too old
+            if entry and (entry["conn"].is_closed() or now - entry["created"] > self.max_age):
+                entry["conn"].close()
+                entry = None
             
-            print(f"✅ Connected to {host}")
+            if entry is None:
+                conn = await asyncssh.connect(
+                    host=host,
+                    username=username,
+                    password=password,
+                    known_hosts=get_known_hosts(),
+                    # Ping the device every 30s so the connection stays open
+                    # while idle, and notice within ~90s if the device is gone
+                    keepalive_interval=30,
+                    keepalive_count_max=3,
+                )
+                entry = {"conn": conn, "created": now}
+                self.connections[key] = entry
             
-            # Store all outputs
-            outputs = []
+            entry["last_used"] = now
             
-            # Run each command
-            for cmd in commands:
-                result = await conn.run(cmd)
-                outputs.append({
-                    "command": cmd,
-                    "output": result.stdout
-                })
+            # Start closing idle connections in the background
+            if self.cleanup_task is None:
+                self.cleanup_task = asyncio.create_task(self._close_idle_connections())
             
+            return entry["conn"]
+    
+    def discard(self, host, username):
+        """Forget a connection that gave an error"""
+        entry = self.connections.pop((host, username), None)
+        if entry:
+            entry["conn"].close()
+    
+    async def _close_idle_connections(self):
+        """Every 30 seconds, close connections nobody used for idle_timeout"""
+        while True:
+            await asyncio.sleep(30)
+            now = time.monotonic()
+            for key, entry in list(self.connections.items()):
+                if now - entry["last_used"] > self.idle_timeout:
+                    entry["conn"].close()
+                    del self.connections[key]
+    
+    async def close(self):
+        """Close all connections (call this before the program ends)"""
+        if self.cleanup_task:
+            self.cleanup_task.cancel()
+            self.cleanup_task = None
+        for entry in self.connections.values():
+            entry["conn"].close()
+            await entry["conn"].wait_closed()
+        self.connections.clear()
+        self.locks.clear()
+
+# One pool for the whole program
+pool = AsyncSSHPool()
+
+async def run_commands_on_device(host, username, password, semaphore):
+    """
+    Connect to one device and run commands
+    This is async - it won't block other devices
+    The semaphore limits how many devices run at the same time
+    """
+    async with semaphore:
+        try:
+            # The timer starts when it's this device's turn, not while waiting
+            return await asyncio.wait_for(
+                run_device_commands(host, username, password),
+                DEVICE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            pool.discard(host, username)
+            print(f"⌛ {host} timed out after {DEVICE_TIMEOUT} seconds")
             return {
                 "host": host,
-                "status": "success",
-                "outputs": outputs
+                "status": "timeout",
+                "error": f"No answer in {DEVICE_TIMEOUT} seconds"
             }
+
+async def run_device_commands(host, username, password):
+    """Run the commands on one device and return the result"""
+    try:
+        # Get an SSH connection (reuses an open one if we have it)
+        conn = await pool.acquire(host, username, password)
+        
+        print(f"✅ Connected to {host}")
+        
+        # Run all commands at the same time - every run opens its own
+        # channel on the same connection, so they don't wait for each other
+        results = await asyncio.gather(
+            *(conn.run(cmd) for cmd in commands),
+            return_exceptions=True
+        )
+        
+        # Nothing worked - the connection itself is probably broken
+        if results and all(isinstance(result, Exception) for result in results):
+            raise results[0]
+        
+        # Match each output with its command
+        outputs = []
+        for cmd, result in zip(commands, results):
+            if isinstance(result, Exception):
+                output = f"ERROR: {result}"
+            else:
+                output = result.stdout
+            outputs.append({
+                "command": cmd,
+                "output": output
+            })
+        
+        return {
+            "host": host,
+            "status": "success",
+            "outputs": outputs
+        }
             
     except asyncssh.Error as e:
         # SSH connection failed
+        pool.discard(host, username)
         print(f"❌ SSH failed for {host}: {str(e)}")
         return {
             "host": host,
@@ -64,6 +220,7 @@ async def run_commands_on_device(device_info):
         }
     except Exception as e:
         # Other errors
+        pool.discard(host, username)
         print(f"⚠️  Error with {host}: {str(e)}")
         return {
             "host": host,
@@ -73,61 +230,61 @@ async def run_commands_on_device(device_info):
 
 async def save_outputs(results):
     """
-    Save command outputs to files
-    Each device gets its own file
+    Save command outputs to a file
+    All devices go into one JSON file, written in one go
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"results_{timestamp}.json"
     
-    for result in results:
-        if result["status"] == "success":
-            filename = f"output_{result['host']}_{timestamp}.txt"
-            
-            with open(filename, "w") as f:
-                f.write(f"Device: {result['host']}\n")
-                f.write(f"Time: {timestamp}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for output in result["outputs"]:
-                    f.write(f"Command: {output['command']}\n")
-                    f.write("-" * 30 + "\n")
-                    f.write(output['output'])
-                    f.write("\n\n")
-            
-            print(f"💾 Saved output for {result['host']} to {filename}")
+    # orjson turns the whole list into bytes in one fast step
+    payload = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    
+    # One open, one write, one close - no matter how many devices
+    async with aiofiles.open(filename, "wb") as f:
+        await f.write(payload)
+    
+    saved = sum(1 for r in results if r["status"] == "success")
+    print(f"💾 Saved output for {saved} devices to {filename}")
 
 async def run_on_all_devices():
     """
     Run commands on all devices at the same time
     This is much faster than doing one by one!
     """
-    print(f"\n🚀 Starting SSH commands on {len(devices)} devices")
+    print(f"\n🚀 Starting SSH commands on {len(HOSTS)} devices")
     print(f"📋 Commands to run: {', '.join(commands)}\n")
     
     # Start timer
     start_time = time.time()
     
-    # Create tasks for all devices
-    # This is like having many workers doing job at same time
-    tasks = []
-    for device in devices:
-        task = asyncio.create_task(run_commands_on_device(device))
-        tasks.append(task)
+    # Only MAX_CONNECTIONS devices at a time, the rest wait their turn
+    semaphore = asyncio.Semaphore(MAX_CONNECTIONS)
     
-    # Wait for all devices to complete
-    # But set a timeout of 30 seconds per device
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Run all devices at the same time and wait for all of them
+    # This is like having many workers doing job at same time
+    # (gather schedules the coroutines itself, no need to make tasks first)
+    # Each device gets DEVICE_TIMEOUT seconds
+    results = await asyncio.gather(
+        *(run_commands_on_device(host, username, password, semaphore)
+          for host, username, password in zip(HOSTS, USERS, PASSWORDS)),
+        return_exceptions=True
+    )
     
     # Count success and failures
     success_count = sum(1 for r in results if isinstance(r, dict) and r.get("status") == "success")
     fail_count = len(results) - success_count
     
-    # Show summary
+    # Show summary - written in one go
     total_time = time.time() - start_time
-    print(f"\n📊 SUMMARY:")
-    print(f"✅ Successful: {success_count} devices")
-    print(f"❌ Failed: {fail_count} devices")
-    print(f"⏱️  Total time: {total_time:.2f} seconds")
-    print(f"💡 Processing {len(devices)} devices one by one would take much longer!")
+    summary = [
+        "",
+        "📊 SUMMARY:",
+        f"✅ Successful: {success_count} devices",
+        f"❌ Failed: {fail_count} devices",
+        f"⏱️  Total time: {total_time:.2f} seconds",
+        f"💡 Processing {len(HOSTS)} devices one by one would take much longer!",
+    ]
+    sys.stdout.write("\n".join(summary) + "\n")
     
     # Save outputs to files
     print(f"\n💾 Saving outputs...")
@@ -141,7 +298,7 @@ async def main():
     print("=" * 50)
     
     # Check if we have devices
-    if not devices:
+    if not HOSTS:
         print("❌ No devices configured! Please add devices to the list.")
         return
     
@@ -149,38 +306,75 @@ async def main():
         # Run commands on all devices
         await run_on_all_devices()
         
-        print("\n✅ All done! Check the output files.")
+        print("\n✅ All done! Check the output file.")
         
     except KeyboardInterrupt:
         print("\n\n👋 Stopped by user. Bye!")
+    finally:
+        await pool.close()
 
 # For reading devices from CSV file (bonus example)
 def read_devices_from_csv(filename):
     """
     Read device list from CSV file
     CSV format: host,username,password
+    Returns the HOSTS, USERS, PASSWORDS tuples used above
     """
-    import csv
-    devices_list = []
-    
     try:
-        with open(filename, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                devices_list.append({
-                    "host": row["host"],
-                    "username": row["username"],
-                    "password": row["password"]
-                })
-        print(f"📄 Loaded {len(devices_list)} devices from {filename}")
-        return devices_list
+        with open(filename, 'r', newline='') as f:
+            text = f.read()
+        
+        if '"' in text:
+            # Quoted fields (like a comma in a password) need the real CSV parser
+            import csv
+            rows = list(csv.reader(text.splitlines()))
+        else:
+            # Plain file - splitting the lines ourselves is much faster
+            rows = [line.split(',') for line in text.splitlines()]
+        
+        # Skip blank lines (csv.reader gives [] for them, split gives [''])
+        rows = [row for row in rows if any(field.strip() for field in row)]
+        
+        # Only a header (or nothing at all) - no devices
+        if len(rows) < 2:
+            print(f"📄 Loaded 0 devices from {filename}")
+            return (), (), ()
+        
+        # The columns can be in any order - find them from the header line
+        # Like csv.DictReader, values are used exactly as written (no strip)
+        header = rows[0]
+        host_col = header.index("host")
+        user_col = header.index("username")
+        password_col = header.index("password")
+        needed = max(host_col, user_col, password_col) + 1
+        
+        hosts, users, passwords = [], [], []
+        for number, row in enumerate(rows[1:], start=1):
+            # A row with missing fields is skipped, the others still load
+            if len(row) < needed:
+                print(f"⚠️  Skipping device row {number} in {filename}: only {len(row)} fields")
+                continue
+            hosts.append(row[host_col])
+            users.append(row[user_col])
+            passwords.append(row[password_col])
+        hosts, users, passwords = tuple(hosts), tuple(users), tuple(passwords)
+        
+        print(f"📄 Loaded {len(hosts)} devices from {filename}")
+        return hosts, users, passwords
     except Exception as e:
         print(f"❌ Error reading CSV: {e}")
-        return []
+        return (), (), ()
 
 # This is where program starts
 if __name__ == "__main__":
+    # uvloop is a faster event loop (Linux/macOS) - use it if it's installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Uncomment next line to read devices from CSV
-    # devices = read_devices_from_csv("devices.csv")
+    # HOSTS, USERS, PASSWORDS = read_devices_from_csv("devices.csv")
     
     asyncio.run(main())
\ No newline at end of file
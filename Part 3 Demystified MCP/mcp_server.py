@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """MCP Server for Arista switches"""
 
-import json
+import asyncio
 import os
 from typing import List, Optional
+import httpx
+import orjson
 import yaml
+from cachetools import TTLCache
 from dotenv import load_dotenv
-import pyeapi
 from fastmcp import FastMCP
 
 # Load environment variables
@@ -26,41 +28,105 @@ for name, device in config.get('devices', {}).items():
         device['password'] = os.getenv(var_name, "")
     DEVICES[name] = device
 
+def url_host(address):
+    # IPv6 addresses need [brackets] inside a URL
+    if ':' in address:
+        return f"[{address}]"
+    return address
+
 # Simple connection manager
 class AristaManager:
     def __init__(self):
         self.connections = {}
+        # Recent command results, so repeated questions within
+        # 5 seconds don't go to the switch again
+        self.cache = TTLCache(maxsize=1024, ttl=5)
     
     def connect(self, device_name):
         if device_name not in DEVICES:
             return None
             
         if device_name not in self.connections:
+            # One client per switch - it keeps the HTTPS connection open
+            # and sends requests over HTTP/2 when the switch supports it.
+            # Errors are not caught here, run_commands reports them
             device = DEVICES[device_name]
+            transport = device.get('transport', 'https')
+            settings = dict(
+                base_url=f"{transport}://{url_host(device['hostname'])}",
+                auth=(device['username'], device['password']),
+                verify=False,
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=4)
+            )
             try:
-                conn = pyeapi.connect(
-                    host=device['hostname'],
-                    username=device['username'],
-                    password=device['password'],
-                    transport=device.get('transport', 'https')
-                )
-                self.connections[device_name] = conn
-            except:
-                return None
+                # HTTP/2 needs the 'h2' package (pip install "httpx[http2]")
+                client = httpx.AsyncClient(http2=True, **settings)
+            except ImportError:
+                # No h2 installed - plain HTTP/1.1 works too
+                client = httpx.AsyncClient(**settings)
+            self.connections[device_name] = client
         return self.connections[device_name]
     
-    def run_command(self, device_name, command):
+    async def run_command(self, device_name, command):
+        result = await self.run_commands(device_name, [command])
+        if isinstance(result, dict):
+            return result
+        return result[0]
+    
+    async def run_commands(self, device_name, cmds):
+        # All commands go to the switch in one eAPI request
+        key = (device_name, tuple(cmds))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            conn = self.connect(device_name)
-            if conn:
-                result = conn.execute([command])
-                return result['result'][0]
-            return {'error': 'Connection failed'}
+            client = self.connect(device_name)
+            if client:
+                response = await client.post('/command-api', json={
+                    'jsonrpc': '2.0',
+                    'method': 'runCmds',
+                    'params': {'version': 1, 'cmds': cmds, 'format': 'json'},
+                    'id': device_name
+                })
+                response.raise_for_status()
+                reply = response.json()
+                if 'error' in reply:
+                    return {'error': reply['error'].get('message', 'Command failed')}
+                # Only good answers are cached - errors are retried next time
+                self.cache[key] = reply['result']
+                return reply['result']
+            return {'error': f'Unknown device {device_name}'}
         except Exception as e:
             return {'error': str(e)}
 
 manager = AristaManager()
 
+async def run_on_devices(device_names, func, *args):
+    # Send the requests to all switches at once
+    outputs = await asyncio.gather(
+        *(func(device, *args) for device in device_names),
+        return_exceptions=True
+    )
+    results = {}
+    for device, output in zip(device_names, outputs):
+        if isinstance(output, Exception):
+            output = {'error': str(output)}
+        results[device] = output
+    return results
+
+# Finished tool replies, so the same question within 5 seconds
+# doesn't even build the JSON again
+response_cache = TTLCache(maxsize=256, ttl=5)
+
+def respond(key, results):
+    response = orjson.dumps(results, option=orjson.OPT_INDENT_2).decode()
+    # Replies with a failed switch aren't kept, the next call tries again
+    if not any(isinstance(output, dict) and list(output) == ['error'] for output in results.values()):
+        response_cache[key] = response
+    return response
+
 # MCP Tools
 @mcp.tool()
 async def show_version(device_names: Optional[List[str]] = None) -> str:
@@ -68,11 +134,14 @@ async def show_version(device_names: Optional[List[str]] = None) -> str:
     if device_names is None:
         device_names = list(DEVICES.keys())
     
-    results = {}
-    for device in device_names:
-        results[device] = manager.run_command(device, 'show version')
+    key = ('show version', tuple(device_names))
+    response = response_cache.get(key)
+    if response is not None:
+        return response
+    
+    results = await run_on_devices(device_names, manager.run_command, 'show version')
     
-    return json.dumps(results, indent=2)
+    return respond(key, results)
 
 @mcp.tool()
 async def show_ip_routes(device_names: Optional[List[str]] = None) -> str:
@@ -80,11 +149,14 @@ async def show_ip_routes(device_names: Optional[List[str]] = None) -> str:
     if device_names is None:
         device_names = list(DEVICES.keys())
     
-    results = {}
-    for device in device_names:
-        results[device] = manager.run_command(device, 'show ip route summary')
+    key = ('show ip route summary', tuple(device_names))
+    response = response_cache.get(key)
+    if response is not None:
+        return response
     
-    return json.dumps(results, indent=2)
+    results = await run_on_devices(device_names, manager.run_command, 'show ip route summary')
+    
+    return respond(key, results)
 
 @mcp.tool()
 async def show_lldp_neighbors(device_names: Optional[List[str]] = None) -> str:
@@ -92,11 +164,14 @@ async def show_lldp_neighbors(device_names: Optional[List[str]] = None) -> str:
     if device_names is None:
         device_names = list(DEVICES.keys())
     
-    results = {}
-    for device in device_names:
-        results[device] = manager.run_command(device, 'show lldp neighbors')
+    key = ('show lldp neighbors', tuple(device_names))
+    response = response_cache.get(key)
+    if response is not None:
+        return response
+    
+    results = await run_on_devices(device_names, manager.run_command, 'show lldp neighbors')
     
-    return json.dumps(results, indent=2)
+    return respond(key, results)
 
 @mcp.tool()
 async def show_interfaces(device_names: Optional[List[str]] = None, interface_name: Optional[str] = None) -> str:
@@ -104,17 +179,41 @@ async def show_interfaces(device_names: Optional[List[str]] = None, interface_na
     if device_names is None:
         device_names = list(DEVICES.keys())
     
-    results = {}
-    for device in device_names:
-        if interface_name:
-            # Get specific interface
-            output = manager.run_command(device, f'show interfaces {interface_name}')
-        else:
-            # Get all interfaces
-            output = manager.run_command(device, 'show interfaces')
-        results[device] = output
+    if interface_name:
+        # Get specific interface
+        command = f'show interfaces {interface_name}'
+    else:
+        # Get all interfaces
+        command = 'show interfaces'
+    
+    key = (command, tuple(device_names))
+    response = response_cache.get(key)
+    if response is not None:
+        return response
+    
+    results = await run_on_devices(device_names, manager.run_command, command)
+    
+    return respond(key, results)
+
+BUNDLE_COMMANDS = ['show version', 'show ip route summary', 'show lldp neighbors']
+
+@mcp.tool()
+async def show_bundle(device_names: Optional[List[str]] = None) -> str:
+    """Get version, routes and LLDP neighbors in one request per switch"""
+    if device_names is None:
+        device_names = list(DEVICES.keys())
+    
+    key = ('bundle', tuple(device_names))
+    response = response_cache.get(key)
+    if response is not None:
+        return response
+    
+    results = await run_on_devices(device_names, manager.run_commands, BUNDLE_COMMANDS)
+    for device, output in results.items():
+        if not isinstance(output, dict):
+            results[device] = dict(zip(BUNDLE_COMMANDS, output))
     
-    return json.dumps(results, indent=2)
+    return respond(key, results)
 
 if __name__ == "__main__":
     print("Starting MCP Server...")